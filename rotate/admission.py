@@ -0,0 +1,328 @@
+#!/usr/bin/env python
+import os
+import sys
+import time
+import stat
+import random
+import tempfile
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, hooks run without a host-wide limit
+    fcntl = None
+
+DEFAULT_SLOTS = 4
+DEFAULT_MAX_WAIT = 300.0
+POLL_INTERVAL = 0.05
+LOG_MAX_BYTES = 64 * 1024
+RECENT_ENTRIES = 20
+
+
+def get_base_directory() -> str:
+    """Return the per-user directory shared by all daemons on this host."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "rotate")
+    return os.path.join(tempfile.gettempdir(), f"rotate-{os.getuid()}")
+
+
+def get_admission_directory() -> str:
+    return os.path.join(get_base_directory(), "hooks")
+
+
+def get_queue_directory() -> str:
+    return os.path.join(get_admission_directory(), "queue")
+
+
+def get_log_file_path() -> str:
+    return os.path.join(get_admission_directory(), "admission.log")
+
+
+def env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def get_slot_count() -> int:
+    """Max concurrent hooks across all daemons (ROTATE_HOOK_SLOTS, 0 = no limit)."""
+    return max(0, int(env_number("ROTATE_HOOK_SLOTS", DEFAULT_SLOTS)))
+
+
+def ensure_private_directory(path: str) -> None:
+    """Create `path` as 0700, or check an existing one is ours and private.
+
+    The fallback base lives in the shared temp dir, where another user could
+    pre-create it and plant tickets that stall everyone's hooks.
+    """
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode):
+        raise PermissionError(f"Not a directory: {path}")
+    if st.st_uid != os.getuid():
+        raise PermissionError(f"Not owned by the current user: {path}")
+    if st.st_mode & 0o077:
+        raise PermissionError(f"Accessible by other users: {path}")
+
+
+def ensure_admission_directory_exists() -> str:
+    for path in (
+        get_base_directory(),
+        get_admission_directory(),
+        get_queue_directory(),
+    ):
+        ensure_private_directory(path)
+    return get_admission_directory()
+
+
+def try_lock_slot(slot: int) -> Optional[int]:
+    """Try to take a slot; return its locked file descriptor or None if busy."""
+    slot_path = os.path.join(get_admission_directory(), f"slot-{slot}")
+    fd = os.open(slot_path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return fd
+    except BlockingIOError:
+        os.close(fd)
+        return None
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def list_queue() -> list[str]:
+    """Return queued tickets in arrival order, dropping those of dead daemons."""
+    queue_dir = get_queue_directory()
+    tickets = []
+    for ticket in sorted(os.listdir(queue_dir)):
+        try:
+            pid = int(ticket.rsplit("-", 1)[1])
+        except (IndexError, ValueError):
+            continue
+        if pid_alive(pid):
+            tickets.append(ticket)
+        else:
+            try:
+                os.unlink(os.path.join(queue_dir, ticket))
+            except FileNotFoundError:
+                pass
+    return tickets
+
+
+def log_admission(event_name: str, waited: float, outcome: str) -> None:
+    """Append a wait time or hook failure to the admission log.
+
+    Hooks run detached with no output, so this log is the only record of how
+    long they waited and why they failed. It is rolled over to `.1` once it
+    grows past LOG_MAX_BYTES.
+    """
+    log_path = get_log_file_path()
+    line = f"{time.time():.3f} {waited:.3f} {event_name} {outcome}\n"
+    try:
+        if os.path.getsize(log_path) > LOG_MAX_BYTES:
+            os.replace(log_path, f"{log_path}.1")
+    except OSError:
+        pass
+    try:
+        fd = os.open(
+            log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_NOFOLLOW, 0o600
+        )
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def read_admission_log(limit: int = RECENT_ENTRIES) -> list[dict]:
+    """Return the latest admission log entries, oldest first."""
+    try:
+        with open(get_log_file_path()) as f:
+            lines = f.read().splitlines()[-limit:]
+    except OSError:
+        return []
+
+    entries = []
+    for line in lines:
+        try:
+            logged_at, waited, event_name, outcome = line.split(" ", 3)
+            entries.append(
+                {
+                    "time": float(logged_at),
+                    "waited": float(waited),
+                    "event": event_name,
+                    "outcome": outcome,
+                }
+            )
+        except ValueError:
+            continue
+    return entries
+
+
+def acquire_hook_slot(event_name: str) -> Optional[int]:
+    """Wait in line for a host-wide hook slot.
+
+    Returns a locked file descriptor; the slot is taken until it is closed.
+    Returns None when admission control is disabled or unavailable, or when
+    the wait exceeds ROTATE_HOOK_MAX_WAIT, in which case the hook should run
+    anyway.
+
+    This blocks, so daemons never call it directly: see `admitted_command`.
+    """
+    slots = get_slot_count()
+    if fcntl is None or slots == 0:
+        return None
+
+    jitter = env_number("ROTATE_HOOK_JITTER", 0)
+    if jitter > 0:
+        time.sleep(random.uniform(0, jitter))
+
+    try:
+        ensure_admission_directory_exists()
+        ticket = f"{time.time_ns():020d}-{os.getpid()}"
+        ticket_path = os.path.join(get_queue_directory(), ticket)
+        os.close(os.open(ticket_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+    except OSError as e:
+        print(f"Hook admission unavailable ({e}), running '{event_name}' hook now")
+        return None
+
+    max_wait = env_number("ROTATE_HOOK_MAX_WAIT", DEFAULT_MAX_WAIT)
+    started = time.monotonic()
+    try:
+        while True:
+            queue = list_queue()
+            # Only the head of the queue may take a slot, so waiters are
+            # admitted in the order they arrived
+            if not queue or queue[0] == ticket:
+                for slot in range(slots):
+                    fd = try_lock_slot(slot)
+                    if fd is not None:
+                        log_admission(
+                            event_name,
+                            time.monotonic() - started,
+                            f"slot {slot}, queue depth {max(0, len(queue) - 1)}",
+                        )
+                        return fd
+
+            waited = time.monotonic() - started
+            if waited > max_wait:
+                log_admission(event_name, waited, "no slot, running anyway")
+                return None
+            time.sleep(POLL_INTERVAL)
+    finally:
+        try:
+            os.unlink(ticket_path)
+        except FileNotFoundError:
+            pass
+
+
+def admitted_command(event_name: str, hook_path: str) -> list[str]:
+    """Return the command that runs a hook once a slot is free.
+
+    With admission control on, the hook is started through `run` below, so
+    the waiting happens in that detached process and never in the daemon.
+    """
+    if fcntl is None or get_slot_count() == 0:
+        return [hook_path]
+    return [sys.executable, "-m", "rotate.admission", "run", event_name, hook_path]
+
+
+def run_hook(event_name: str, hook_path: str) -> int:
+    """Wait for a slot, run the hook and release the slot when it exits.
+
+    The lock stays in this process: a hook's background children (an editor
+    it opened, say) don't inherit it and can't keep the slot taken.
+    """
+    import subprocess
+
+    fd = acquire_hook_slot(event_name)
+    started = time.monotonic()
+    try:
+        returncode = subprocess.run([hook_path], close_fds=True).returncode
+    except OSError as e:
+        log_admission(event_name, 0.0, f"failed to start {hook_path}: {e}")
+        return 127
+    finally:
+        if fd is not None:
+            os.close(fd)
+
+    if returncode != 0:
+        log_admission(
+            event_name,
+            time.monotonic() - started,
+            f"{hook_path} exited with status {returncode}",
+        )
+    return returncode
+
+
+def admission_status() -> dict:
+    """Report busy slots, queue depth and how long each waiter has waited."""
+    slots = get_slot_count()
+    status = {"slots": slots, "busy": 0, "queued": 0, "waits": [], "recent": []}
+    if fcntl is None or slots == 0 or not os.path.isdir(get_queue_directory()):
+        return status
+
+    try:
+        ensure_admission_directory_exists()
+    except OSError as e:
+        status["error"] = str(e)
+        return status
+
+    for slot in range(slots):
+        fd = try_lock_slot(slot)
+        if fd is None:
+            status["busy"] += 1
+        else:
+            os.close(fd)
+
+    now = time.time_ns()
+    queue = list_queue()
+    status["queued"] = len(queue)
+    status["waits"] = [(now - int(ticket.split("-")[0])) / 1e9 for ticket in queue]
+    status["recent"] = read_admission_log()
+    return status
+
+
+def main():
+    """CLI entry point: print hook admission status, or run a hook when admitted."""
+    if len(sys.argv) == 4 and sys.argv[1] == "run":
+        sys.exit(run_hook(sys.argv[2], sys.argv[3]))
+
+    status = admission_status()
+    if status["slots"] == 0:
+        print("Hook admission control disabled (ROTATE_HOOK_SLOTS=0)")
+        sys.exit(0)
+    if "error" in status:
+        print(f"Hook admission unavailable: {status['error']}")
+        sys.exit(1)
+
+    print(f"Hook slots: {status['busy']}/{status['slots']} busy")
+    print(f"Queue depth: {status['queued']}")
+    if status["waits"]:
+        print(f"Longest wait: {max(status['waits']):.2f}s")
+    if status["recent"]:
+        print(f"Recent hooks (log: {get_log_file_path()}):")
+        for entry in status["recent"]:
+            logged_at = time.strftime("%H:%M:%S", time.localtime(entry["time"]))
+            print(
+                f"  {logged_at} {entry['event']}: waited {entry['waited']:.2f}s, "
+                f"{entry['outcome']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
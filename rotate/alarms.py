@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+import heapq
+import threading
+import itertools
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from rotate.hooks import execute_hooks, list_hook_events
+
+REMAINING_PREFIX = "remaining-"
+
+
+def alarm_offset(event_name: str, total_seconds: float) -> Optional[float]:
+    """Return the remaining seconds at which an alarm event fires.
+
+    `halfway` fires at half the turn, `remaining-M:SS` (e.g. `remaining-1:00`)
+    when that much time is left. Other event names are not alarms.
+    """
+    if event_name == "halfway":
+        return total_seconds / 2
+    if event_name.startswith(REMAINING_PREFIX):
+        minutes, _, seconds = event_name[len(REMAINING_PREFIX) :].partition(":")
+        if not (minutes.isdigit() and seconds.isdigit()):
+            return None
+        return int(minutes) * 60 + int(seconds)
+    return None
+
+
+class AlarmScheduler:
+    """Pending alarms in a min-heap keyed on deadline."""
+
+    def __init__(self):
+        self.heap: List[Tuple[datetime, int, str]] = []
+        self.counter = itertools.count()  # tie-breaker keeps insertion order
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def schedule(self, event_name: str, deadline: datetime) -> None:
+        heapq.heappush(self.heap, (deadline, next(self.counter), event_name))
+
+    def next_deadline(self) -> Optional[datetime]:
+        return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, now: datetime) -> List[str]:
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            due.append(heapq.heappop(self.heap)[2])
+        return due
+
+    def shift(self, delta: timedelta) -> None:
+        """Push every deadline back, e.g. by the time spent paused.
+
+        Shifting all keys by the same amount keeps the heap ordered.
+        """
+        self.heap = [(deadline + delta, n, name) for deadline, n, name in self.heap]
+
+    def seconds_until_next(self, now: datetime) -> Optional[float]:
+        deadline = self.next_deadline()
+        if deadline is None:
+            return None
+        return max(0.0, (deadline - now).total_seconds())
+
+
+def fire_alarm(event_name: str, file_path: str) -> None:
+    """Run an alarm's hooks off the timer thread so the tick loop keeps time.
+
+    Not a daemon thread: the process waits for the spawn before exiting.
+    """
+    print(f"Alarm: {event_name}")
+    threading.Thread(
+        target=execute_hooks, args=(event_name, file_path), name=f"alarm-{event_name}"
+    ).start()
+
+
+def pending_alarms(
+    remaining_seconds: float, total_seconds: float
+) -> List[Tuple[str, float]]:
+    """List (event name, seconds from now) for alarm hooks still ahead in this turn."""
+    pending = []
+    for event_name in list_hook_events():
+        offset = alarm_offset(event_name, total_seconds)
+        if offset is not None and 0 < offset < remaining_seconds:
+            pending.append((event_name, remaining_seconds - offset))
+    return pending
+
+
+def schedule_alarms(
+    start_timestamp: datetime, remaining_seconds: float, total_seconds: float
+) -> AlarmScheduler:
+    """Schedule an alarm for every alarm hook that is still ahead in this turn."""
+    alarms = AlarmScheduler()
+    for event_name, seconds in pending_alarms(remaining_seconds, total_seconds):
+        alarms.schedule(event_name, start_timestamp + timedelta(seconds=seconds))
+    return alarms
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+import os
+import sys
+import time
+import marshal
+from datetime import time as clock_time
+from rotate.parse import Rotation, Timer
+
+CACHE_VERSION = 1
+
+# A file rewritten within the filesystem's timestamp granularity can keep the
+# same (inode, size, mtime) with new content, so recently modified files are
+# not cached until their mtime is safely in the past
+RACY_WINDOW_NS = 20_000_000
+COARSE_RACY_WINDOW_NS = 1_000_000_000
+
+
+def get_cache_file_path(rotation_file_path: str) -> str:
+    return f"{rotation_file_path}.cache"
+
+
+def parse_cache_enabled() -> bool:
+    """Whether read_rotation_file should use the sidecar cache (ROTATE_PARSE_CACHE)."""
+    return os.environ.get("ROTATE_PARSE_CACHE", "").lower() in ("1", "true", "yes")
+
+
+def file_stamp(st: os.stat_result) -> tuple[int, int, int]:
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def is_racy(st: os.stat_result) -> bool:
+    # Whole-second mtimes suggest a filesystem with 1s granularity
+    window = (
+        COARSE_RACY_WINDOW_NS
+        if st.st_mtime_ns % 1_000_000_000 == 0
+        else RACY_WINDOW_NS
+    )
+    return time.time_ns() - st.st_mtime_ns < window
+
+
+def read_cache(rotation_file_path: str, stamp: tuple[int, int, int]) -> Rotation | None:
+    """Return the cached Rotation if the cache matches the file's stamp."""
+    try:
+        with open(get_cache_file_path(rotation_file_path), "rb") as f:
+            entry = marshal.loads(f.read())
+        version, cached_stamp, remaining, total, positions, team = entry
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if version != CACHE_VERSION or tuple(cached_stamp) != stamp:
+        return None
+
+    timer = Timer(
+        remaining=clock_time(minute=remaining[0], second=remaining[1]),
+        total=clock_time(minute=total[0], second=total[1]),
+    )
+    return Rotation(
+        timer=timer,
+        positions=positions.split("\n") if positions else [],
+        team=team.split("\n") if team else [],
+    )
+
+
+def write_cache(rotation_file_path: str, st: os.stat_result, rotation: Rotation) -> None:
+    """Store the parsed Rotation beside the file; failures are ignored."""
+    if is_racy(st):
+        return
+
+    timer = rotation.timer
+    entry = (
+        CACHE_VERSION,
+        file_stamp(st),
+        (timer.remaining.minute, timer.remaining.second),
+        (timer.total.minute, timer.total.second),
+        # Names are single lines, so one joined string per list loads faster
+        # than a list of many small strings
+        "\n".join(rotation.positions),
+        "\n".join(rotation.team),
+    )
+    cache_path = get_cache_file_path(rotation_file_path)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(marshal.dumps(entry))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def benchmark(roster_size: int = 5000, rounds: int = 200) -> None:
+    """Compare a full parse with a cache hit on a large roster."""
+    import tempfile
+    from rotate.rotation import read_rotation_file, create_rotation_file
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "rotation")
+        create_rotation_file(file_path, [f"Member{i}" for i in range(roster_size)])
+        # Age the file past the racy window so the cache can be written
+        past = time.time_ns() - 10 * COARSE_RACY_WINDOW_NS
+        os.utime(file_path, ns=(past, past))
+
+        read_rotation_file(file_path, use_cache=True)
+        assert os.path.exists(get_cache_file_path(file_path))
+
+        results = {}
+        for label, use_cache in (("parse", False), ("cache hit", True)):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                rotation = read_rotation_file(file_path, use_cache=use_cache)
+            results[label] = (time.perf_counter() - start) / rounds
+            assert len(rotation.team) == roster_size
+
+    print(f"Roster of {roster_size}, {rounds} reads each:")
+    for label, seconds in results.items():
+        print(f"  {label:<10} {seconds * 1e6:10.1f} us/read")
+    print(f"  speedup    {results['parse'] / results['cache hit']:10.1f}x")
+
+
+def main():
+    """CLI entry point for benchmarking the parse cache."""
+    if len(sys.argv) < 2 or sys.argv[1] != "bench":
+        print("Usage: python -m rotate.cache bench [roster_size]")
+        sys.exit(1)
+
+    roster_size = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    benchmark(roster_size)
+
+
+if __name__ == "__main__":
+    main()
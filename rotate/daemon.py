@@ -12,6 +12,12 @@ from rotate.rotation import read_rotation_file, write_rotation_file
 from rotate.ipc import read_command, cleanup_ipc_file
 from rotate.rotate import rotate_team
 from rotate.hooks import execute_hooks
+from rotate.alarms import AlarmScheduler, fire_alarm, schedule_alarms
+from rotate.writer import RotationWriter
+from rotate import trace
+
+# How long exit paths wait for pending writes before giving up
+FLUSH_TIMEOUT = 5.0
 
 
 def time_to_timedelta(t) -> timedelta:
@@ -24,14 +30,23 @@ def timedelta_to_time(td: timedelta):
     return datetime.strptime(f"{minutes}:{seconds:02d}", "%M:%S").time()
 
 
-def update_rotation_file(file_path: str, rotation: Rotation):
-    write_rotation_file(file_path, rotation)
+def update_rotation_file(
+    file_path: str, rotation: Rotation, writer: RotationWriter | None = None
+):
+    if writer is not None:
+        # Hand off to the writer thread; the tick loop never waits on disk
+        writer.submit(rotation, trace.take_command())
+        return
+    with trace.span("write_rotation_file", trace.take_command(), flow="f"):
+        write_rotation_file(file_path, rotation)
     print(f"File updated: {file_path}")
 
 
-def setup_signal_handlers(file_path: str) -> None:
+def setup_signal_handlers(file_path: str, writer: RotationWriter | None = None) -> None:
     def signal_handler(sig, frame):
         print("\nDaemon stopping...")
+        if writer is not None and not writer.close(FLUSH_TIMEOUT):
+            print("Warning: rotation file may not have the latest state")
         print("Triggering expire hook before exit...")
         execute_hooks("expire", file_path)
         sys.exit(0)
@@ -58,6 +73,7 @@ def handle_command(
     is_paused: bool,
     pause_timestamp: datetime | None,
     start_timestamp: datetime,
+    alarms: AlarmScheduler | None = None,
 ) -> tuple[bool, datetime | None, datetime, bool]:
     should_stop = False
 
@@ -70,6 +86,8 @@ def handle_command(
         if is_paused and pause_timestamp is not None:
             pause_duration = (datetime.now() - pause_timestamp).total_seconds()
             start_timestamp = start_timestamp + timedelta(seconds=pause_duration)
+            if alarms is not None:
+                alarms.shift(timedelta(seconds=pause_duration))
             is_paused = False
             print(f"Timer resumed (paused for {pause_duration:.1f}s)")
     elif command == "stop":
@@ -85,6 +103,7 @@ def update_timer(
     remaining_seconds: float,
     total_seconds: float,
     start_timestamp: datetime,
+    writer: RotationWriter | None = None,
 ) -> tuple[Rotation, float, bool]:
     now = datetime.now()
     seconds_since_start = (now - start_timestamp).total_seconds()
@@ -99,7 +118,7 @@ def update_timer(
         timer=updated_timer, positions=rotation.positions, team=rotation.team
     )
 
-    update_rotation_file(file_path, updated_rotation)
+    update_rotation_file(file_path, updated_rotation, writer)
 
     elapsed = total_seconds - new_remaining_seconds
     print(
@@ -111,15 +130,33 @@ def update_timer(
     return updated_rotation, new_remaining_seconds, timer_expired
 
 
-def handle_timer_expiration(file_path: str, updated_rotation: Rotation) -> Rotation:
+def fire_due_alarms(file_path: str, alarms: AlarmScheduler) -> None:
+    for event_name in alarms.pop_due(datetime.now()):
+        fire_alarm(event_name, file_path)
+
+
+def next_sleep(update_interval: int, alarms: AlarmScheduler) -> float:
+    """Sleep until the next tick, or earlier if an alarm falls due first."""
+    until_alarm = alarms.seconds_until_next(datetime.now())
+    if until_alarm is None:
+        return update_interval
+    return min(update_interval, until_alarm)
+
+
+def handle_timer_expiration(
+    file_path: str, updated_rotation: Rotation, writer: RotationWriter | None = None
+) -> Rotation:
     print("\nTimer expired! Triggering rotation...")
+    # Hooks read the file, so let them see the expired timer
+    if writer is not None:
+        writer.flush(FLUSH_TIMEOUT)
     print("Triggering expire hook...")
     execute_hooks("expire", file_path)
 
     updated_rotation = rotate_team(updated_rotation)
     updated_rotation.timer.remaining = updated_rotation.timer.total
 
-    update_rotation_file(file_path, updated_rotation)
+    update_rotation_file(file_path, updated_rotation, writer)
     print("Rotation complete. Use 'rotate start' to start the next timer.")
 
     return updated_rotation
@@ -128,7 +165,6 @@ def handle_timer_expiration(file_path: str, updated_rotation: Rotation) -> Rotat
 def start_daemon(file_path: str, update_interval: int = 1):
     print(f"Starting daemon for {file_path}...")
 
-    setup_signal_handlers(file_path)
     cleanup_ipc_file(file_path)
 
     try:
@@ -136,6 +172,10 @@ def start_daemon(file_path: str, update_interval: int = 1):
     except Exception:
         return
 
+    writer = RotationWriter(file_path)
+    writer.start()
+    setup_signal_handlers(file_path, writer)
+
     start_timestamp = datetime.now()
     print(f"Start time: {start_timestamp}")
     print(f"Initial values: Remaining: {remaining_seconds}s, Total: {total_seconds}s")
@@ -143,6 +183,10 @@ def start_daemon(file_path: str, update_interval: int = 1):
     update_interval = int(update_interval)
     print(f"Update interval: {update_interval} seconds")
 
+    alarms = schedule_alarms(start_timestamp, remaining_seconds, total_seconds)
+    if alarms:
+        print(f"Alarms scheduled: {len(alarms)}")
+
     is_paused = False
     pause_timestamp = None
 
@@ -151,9 +195,15 @@ def start_daemon(file_path: str, update_interval: int = 1):
             command = read_command(file_path)
             if command:
                 print(f"Received command: {command}")
-                is_paused, pause_timestamp, start_timestamp, should_stop = (
-                    handle_command(command, is_paused, pause_timestamp, start_timestamp)
-                )
+                with trace.span("handle_command", flow="t", command=command):
+                    is_paused, pause_timestamp, start_timestamp, should_stop = (
+                        handle_command(
+                            command, is_paused, pause_timestamp, start_timestamp, alarms
+                        )
+                    )
+                if should_stop or is_paused:
+                    # No tick write follows to end the command's flow
+                    trace.finish_command()
                 if should_stop:
                     break
 
@@ -162,14 +212,22 @@ def start_daemon(file_path: str, update_interval: int = 1):
                 continue
 
             updated_rotation, new_remaining_seconds, timer_expired = update_timer(
-                file_path, rotation, remaining_seconds, total_seconds, start_timestamp
+                file_path,
+                rotation,
+                remaining_seconds,
+                total_seconds,
+                start_timestamp,
+                writer,
             )
 
             if timer_expired:
-                updated_rotation = handle_timer_expiration(file_path, updated_rotation)
+                updated_rotation = handle_timer_expiration(
+                    file_path, updated_rotation, writer
+                )
                 break
 
-            time.sleep(update_interval)
+            fire_due_alarms(file_path, alarms)
+            time.sleep(next_sleep(update_interval, alarms))
 
         except FileNotFoundError:
             print(f"\nError: Rotation file not found: {file_path}")
@@ -181,6 +239,9 @@ def start_daemon(file_path: str, update_interval: int = 1):
             traceback.print_exc()
             break
 
+    if not writer.close(FLUSH_TIMEOUT):
+        print("Warning: rotation file may not have the latest state")
+
 
 def main():
     # Simple argument handling
@@ -1,8 +1,7 @@
 #!/usr/bin/env python
 import os
-import subprocess
 import sys
-from typing import List
+from rotate import trace
 
 
 def get_rotate_directory() -> str:
@@ -45,7 +44,7 @@ def ensure_hooks_directory_exists() -> str:
     return hooks_dir
 
 
-def list_hooks(event_name: str) -> List[str]:
+def list_hooks(event_name: str) -> list[str]:
     """List all hook scripts for a specific event."""
     hooks_dir = get_hooks_directory()
     if not os.path.exists(hooks_dir):
@@ -59,6 +58,19 @@ def list_hooks(event_name: str) -> List[str]:
     return []
 
 
+def list_hook_events() -> list[str]:
+    """List the event names that have an executable hook."""
+    hooks_dir = get_hooks_directory()
+    if not os.path.isdir(hooks_dir):
+        return []
+
+    return sorted(
+        name
+        for name in os.listdir(hooks_dir)
+        if os.access(os.path.join(hooks_dir, name), os.X_OK)
+    )
+
+
 def execute_hooks(event_name: str, rotation_file_path: str | None = None) -> None:
     """Execute all hooks for the given event.
 
@@ -72,6 +84,10 @@ def execute_hooks(event_name: str, rotation_file_path: str | None = None) -> Non
         print(f"No hooks found for event: {event_name}")
         return
 
+    # Deferred so a long-running daemon only loads these once a hook fires
+    import subprocess
+    from rotate.admission import admitted_command
+
     print(f"Executing {len(hooks)} hook(s) for event '{event_name}'...")
 
     # Prepare environment with ROTATION_FILE if provided
@@ -83,15 +99,18 @@ def execute_hooks(event_name: str, rotation_file_path: str | None = None) -> Non
     for hook_path in hooks:
         try:
             print(f"Running hook: {hook_path}")
-            # Run the hook as a detached process so it doesn't block the daemon
-            subprocess.Popen(
-                hook_path,
-                env=env,
-                start_new_session=True,  # Disown the process
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                close_fds=True,
-            )
+            # Run the hook as a detached process so it doesn't block the daemon.
+            # With admission control the process first waits for a host-wide
+            # slot, so many daemons expiring at once don't all start together
+            with trace.span("hook spawn", event=event_name, hook=hook_path):
+                subprocess.Popen(
+                    admitted_command(event_name, hook_path),
+                    env=env,
+                    start_new_session=True,  # Disown the process
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    close_fds=True,
+                )
             print(f"Hook started: {hook_path}")
         except Exception as e:
             print(f"Error executing hook '{hook_path}': {e}")
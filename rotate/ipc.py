@@ -1,19 +1,24 @@
 #!/usr/bin/env python
 import os
-from typing import Optional
+from rotate import trace
 
 
 def get_ipc_file_path(rotation_file_path: str) -> str:
     return f"{rotation_file_path}.ipc"
 
 
-def write_command(rotation_file_path: str, command: str) -> None:
+def write_command(
+    rotation_file_path: str, command: str, command_id: str | None = None
+) -> None:
     ipc_file_path = get_ipc_file_path(rotation_file_path)
     with open(ipc_file_path, "w") as f:
         f.write(command)
+        if command_id:
+            # Second line lets a tracing daemon correlate its spans
+            f.write(f"\n{command_id} {trace.now_us()}")
 
 
-def read_command(rotation_file_path: str) -> Optional[str]:
+def read_command(rotation_file_path: str) -> str | None:
     ipc_file_path = get_ipc_file_path(rotation_file_path)
 
     if not os.path.exists(ipc_file_path):
@@ -21,14 +26,27 @@ def read_command(rotation_file_path: str) -> Optional[str]:
 
     try:
         with open(ipc_file_path, "r") as f:
-            command = f.read().strip()
+            command, _, trace_line = f.read().strip().partition("\n")
 
         os.unlink(ipc_file_path)
-        return command
+        if trace_line and trace.ENABLED:
+            record_ipc_wait(trace_line)
+        return command.strip()
     except Exception:
         return None
 
 
+def record_ipc_wait(trace_line: str) -> None:
+    """Trace the time from `write_command` until this poll picked it up."""
+    try:
+        command_id, sent_us = trace_line.split()
+        sent_us = int(sent_us)
+    except ValueError:
+        return
+    trace.set_command(command_id)
+    trace.record("ipc wait", sent_us, trace.now_us(), command_id, flow="t")
+
+
 def cleanup_ipc_file(rotation_file_path: str) -> None:
     ipc_file_path = get_ipc_file_path(rotation_file_path)
     if os.path.exists(ipc_file_path):
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+"""Minimal-footprint timer daemon.
+
+Same behaviour and arguments as `rotate.daemon`, but it only keeps `os`,
+`sys`, `time` and the IPC helpers resident while counting down. The timer
+line is parsed with plain string operations, every tick rewrites the digits
+of one preformatted buffer, and the parse/rotate/hooks stack is only
+imported when the timer expires, an alarm fires or the daemon is signalled.
+
+Usage: python -m rotate.lean_daemon <rotation_file_path> [update_interval]
+"""
+import gc
+import os
+import sys
+import time
+import signal
+from rotate.ipc import get_ipc_file_path, read_command, cleanup_ipc_file
+from rotate import trace
+
+
+def parse_timer_seconds(value: str) -> int:
+    minutes, _, seconds = value.strip().partition(":")
+    return int(minutes) * 60 + int(seconds)
+
+
+def format_seconds(seconds: int) -> str:
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def load_timer(file_path: str) -> tuple[int, int, bytes]:
+    """Return (remaining, total, rest of file) without parsing the roster."""
+    with open(file_path, "rb") as f:
+        content = f.read()
+
+    timer_line, newline, rest = content.partition(b"\n")
+    remaining, _, total = timer_line.decode().partition("/")
+    return parse_timer_seconds(remaining), parse_timer_seconds(total), newline + rest
+
+
+class TickBuffer:
+    """The rotation file's bytes with the remaining time rewritten in place.
+
+    Only the `M:SS` digits change between ticks, so each tick renders into
+    the same buffer instead of formatting a new string. The digits sit in a
+    fixed-width field padded with spaces (`9:59  / 10:00`), so every tick
+    writes the same number of bytes over the previous ones and a reader never
+    sees a file that is cut short or has a stale byte at the end.
+    """
+
+    def __init__(self, remaining: int, tail: bytes):
+        self.width = len(format_seconds(remaining))
+        self.buffer = bytearray(b" " * self.width) + tail
+        self.view = memoryview(self.buffer)
+
+    def render(self, seconds: int) -> int:
+        """Write `seconds` as M:SS at the start of the field; return its end."""
+        buffer = self.buffer
+        minutes, seconds = divmod(seconds, 60)
+        digits = 1
+        while minutes >= 10**digits:
+            digits += 1
+        end = digits + 3
+        buffer[digits] = 58  # ":"
+        buffer[digits + 1] = 48 + seconds // 10
+        buffer[digits + 2] = 48 + seconds % 10
+        for pos in range(digits - 1, -1, -1):
+            buffer[pos] = 48 + minutes % 10
+            minutes //= 10
+        for pos in range(end, self.width):
+            buffer[pos] = 32  # " "
+        return end
+
+    def write(self, file_path: str) -> None:
+        # No O_TRUNC: an empty file would be visible between the truncate and
+        # the write, and on ext4 it makes every close flush the data to disk
+        fd = os.open(file_path, os.O_WRONLY)
+        try:
+            # Only shortens the file if something else rewrote it longer
+            os.ftruncate(fd, os.pwrite(fd, self.view, 0))
+        finally:
+            os.close(fd)
+
+    def log(self, end: int) -> None:
+        os.write(1, b"Updated: Remaining: ")
+        os.write(1, self.view[:end])
+        os.write(1, b"\n")
+
+
+def expire(file_path: str) -> None:
+    from rotate.daemon import handle_timer_expiration
+    from rotate.rotation import read_rotation_file
+
+    handle_timer_expiration(file_path, read_rotation_file(file_path))
+
+
+def setup_signal_handlers(file_path: str) -> None:
+    def signal_handler(sig, frame):
+        from rotate.hooks import execute_hooks
+
+        print("\nDaemon stopping...")
+        print("Triggering expire hook before exit...")
+        execute_hooks("expire", file_path)
+        sys.exit(0)
+
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+
+def schedule_alarms(start: float, remaining: int, total: int):
+    """Load the alarm scheduler only when this turn has alarm hooks."""
+    from rotate.hooks import list_hook_events
+
+    # Cheap name check first, see rotate.alarms.alarm_offset
+    if not any(
+        name == "halfway" or name.startswith("remaining-")
+        for name in list_hook_events()
+    ):
+        return None
+
+    from rotate.alarms import AlarmScheduler, pending_alarms
+
+    pending = pending_alarms(remaining, total)
+    if not pending:
+        return None
+
+    alarms = AlarmScheduler()
+    for event_name, seconds in pending:
+        alarms.schedule(event_name, start + seconds)
+    print(f"Alarms scheduled: {len(alarms)}")
+    return alarms
+
+
+def start_daemon(file_path: str, update_interval: int = 1):
+    print(f"Starting lean daemon for {file_path}...")
+
+    setup_signal_handlers(file_path)
+    cleanup_ipc_file(file_path)
+    ipc_file_path = get_ipc_file_path(file_path)
+
+    try:
+        remaining, total, rest = load_timer(file_path)
+    except Exception as e:
+        print(f"Error reading rotation file: {e}")
+        return
+
+    tick = TickBuffer(remaining, f" / {format_seconds(total)}".encode() + rest)
+    print(f"Initial values: Remaining: {remaining}s, Total: {total}s")
+    print(f"Update interval: {update_interval} seconds", flush=True)
+
+    start = time.monotonic()
+    alarms = schedule_alarms(start, remaining, total)
+    paused_at = None
+
+    # Everything allocated so far lives until exit; keep the collector off it
+    gc.collect()
+    gc.freeze()
+
+    while True:
+        try:
+            if os.path.exists(ipc_file_path):
+                command = read_command(file_path)
+                if command:
+                    print(f"Received command: {command}")
+                with trace.span("handle_command", flow="t", command=command):
+                    if command == "pause" and paused_at is None:
+                        paused_at = time.monotonic()
+                        print("Timer paused", flush=True)
+                    elif command == "resume" and paused_at is not None:
+                        pause_duration = time.monotonic() - paused_at
+                        start += pause_duration
+                        if alarms is not None:
+                            alarms.shift(pause_duration)
+                        paused_at = None
+                        print(f"Timer resumed (paused for {pause_duration:.1f}s)")
+                if command == "stop" or paused_at is not None:
+                    # No tick write follows to end the command's flow
+                    trace.finish_command()
+                if command == "stop":
+                    print("Stopping daemon...", flush=True)
+                    break
+
+            if paused_at is not None:
+                time.sleep(update_interval)
+                continue
+
+            now = time.monotonic()
+            left = remaining - (now - start)
+            end = tick.render(max(0, int(left)))
+            with trace.span("write_rotation_file", trace.take_command(), flow="f"):
+                tick.write(file_path)
+            sys.stdout.flush()
+            tick.log(end)
+
+            if left <= 0:
+                expire(file_path)
+                break
+
+            sleep = update_interval
+            if alarms is not None:
+                for event_name in alarms.pop_due(now):
+                    from rotate.alarms import fire_alarm
+
+                    fire_alarm(event_name, file_path)
+                deadline = alarms.next_deadline()
+                if deadline is not None:
+                    sleep = min(sleep, max(0.0, deadline - now))
+            time.sleep(sleep)
+
+        except FileNotFoundError:
+            print(f"\nError: Rotation file not found: {file_path}")
+            break
+        except Exception as e:
+            print(f"\nError in daemon: {e}")
+            import traceback
+
+            traceback.print_exc()
+            break
+
+    sys.stdout.flush()
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python -m rotate.lean_daemon <rotation_file_path> [update_interval]")
+        sys.exit(1)
+
+    file_path = sys.argv[1]
+
+    update_interval = 1
+    if len(sys.argv) > 2:
+        try:
+            update_interval = int(sys.argv[2])
+        except ValueError:
+            print(f"Invalid update interval: {sys.argv[2]}. Using default (1 second).")
+
+    start_daemon(file_path, update_interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+#!/usr/bin/env python
+"""Load harness: many daemons, many clients, real IPC.
+
+Spawns N timer daemons on temporary rotation files and drives M client
+threads that send pause/resume through `write_command` (the same path the
+`rotate` CLI uses) and rotate the team the way `rotate rotate` does.
+Reports command-to-effect latency, tick jitter, missed expirations, CPU
+and RSS so IPC and scheduler implementations can be compared.
+
+Usage: python -m rotate.loadtest [--daemons N] [--clients M] [--duration S]
+                                 [--daemon-module rotate.daemon] [--json]
+                                 [--max-rss-kb KIB]
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import shutil
+import signal
+import resource
+import tempfile
+import threading
+import subprocess
+from typing import Dict, List, Optional
+from rotate.ipc import write_command
+from rotate.parse import parse_time
+from rotate.rotate import rotate_team
+from rotate.rotation import (
+    create_rotation_file,
+    read_rotation_file,
+    write_rotation_file,
+)
+
+TEAM = ["Alice", "Bob", "Charlie", "Diana", "Eva"]
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class DaemonHandle:
+    """A spawned daemon plus a reader thread timestamping its output."""
+
+    def __init__(self, index: int, file_path: str, module: str, interval: int):
+        self.index = index
+        self.file_path = file_path
+        self.interval = interval
+        self.lock = threading.Lock()  # one outstanding client command at a time
+        self.changed = threading.Condition()
+        self.paused = False
+        self.paused_count = 0
+        self.resumed_count = 0
+        self.ticks = 0
+        self.last_tick: Optional[float] = None
+        self.last_remaining: Optional[float] = None
+        self.jitter: List[float] = []
+        self.expired_at: Optional[float] = None
+        self.exited_at: Optional[float] = None
+
+        # Run from the rotation file's directory to keep the caller's hooks
+        # out of it, while still importing this checkout of the package
+        env = os.environ.copy()
+        env["PYTHONPATH"] = os.pathsep.join(
+            p for p in (PACKAGE_ROOT, env.get("PYTHONPATH")) if p
+        )
+        self.process = subprocess.Popen(
+            [sys.executable, "-u", "-m", module, file_path, str(interval)],
+            cwd=os.path.dirname(file_path),
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+        self.reader = threading.Thread(target=self.read_output, daemon=True)
+        self.reader.start()
+
+    def read_output(self) -> None:
+        for line in self.process.stdout:
+            now = time.monotonic()
+            with self.changed:
+                if line.startswith("Updated: Remaining: "):
+                    remaining = line[len("Updated: Remaining: ") :].split(",")[0]
+                    t = parse_time(remaining.strip())
+                    self.last_remaining = t.minute * 60 + t.second
+                    if self.last_tick is not None:
+                        self.jitter.append(now - self.last_tick - self.interval)
+                    self.last_tick = now
+                    self.ticks += 1
+                elif line.startswith("Timer paused"):
+                    self.paused_count += 1
+                    self.last_tick = None
+                elif line.startswith("Timer resumed"):
+                    self.resumed_count += 1
+                    self.last_tick = None
+                elif line.startswith("Timer expired!"):
+                    self.expired_at = now
+                self.changed.notify_all()
+
+        with self.changed:
+            self.exited_at = time.monotonic()
+            self.changed.notify_all()
+
+    def alive(self) -> bool:
+        return self.exited_at is None and self.expired_at is None
+
+    def wait_for(self, predicate, timeout: float) -> bool:
+        with self.changed:
+            return self.changed.wait_for(predicate, timeout)
+
+    def memory_kb(self, field: str) -> Optional[int]:
+        """Read a memory field (VmRSS, VmHWM) from /proc; None where unavailable."""
+        try:
+            with open(f"/proc/{self.process.pid}/status") as f:
+                for line in f:
+                    if line.startswith(field + ":"):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        return None
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def at(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "p50": at(0.50),
+        "p90": at(0.90),
+        "p99": at(0.99),
+        "max": ordered[-1],
+    }
+
+
+def measure_rotate(
+    daemon: DaemonHandle,
+    effect_timeout: float,
+    rotates: Dict[str, list],
+    results_lock: threading.Lock,
+) -> None:
+    """Rotate the way `rotate rotate` does: rewrite the file in place.
+
+    The daemon doesn't handle this as a command, so it is reported apart
+    from command latencies: how long the rewrite took, and whether the
+    daemon's next tick overwrote it with its in-memory roster.
+    """
+    start = time.monotonic()
+    rotated = rotate_team(read_rotation_file(daemon.file_path))
+    write_rotation_file(daemon.file_path, rotated)
+    elapsed = time.monotonic() - start
+
+    with daemon.changed:
+        ticks = daemon.ticks
+    ticked = daemon.wait_for(
+        lambda: daemon.ticks > ticks or not daemon.alive(), effect_timeout
+    )
+    overwritten = ticked and read_rotation_file(daemon.file_path).team != rotated.team
+
+    with results_lock:
+        rotates["rewrite_seconds"].append(elapsed)
+        rotates["overwritten"].append(overwritten)
+
+
+def measure_command(daemon: DaemonHandle, command: str, effect_timeout: float):
+    """Send pause/resume over IPC; return the time until the daemon reports it.
+
+    Returns None if the daemon didn't act on it within the timeout.
+    """
+    counter = "paused_count" if command == "pause" else "resumed_count"
+    with daemon.changed:
+        seen = getattr(daemon, counter)
+
+    start = time.monotonic()
+    write_command(daemon.file_path, command)
+    effected = daemon.wait_for(
+        lambda: getattr(daemon, counter) > seen or not daemon.alive(),
+        effect_timeout,
+    )
+    if not (effected and daemon.alive()):
+        return None
+    daemon.paused = command == "pause"
+    return time.monotonic() - start
+
+
+def run_client(
+    daemons: List[DaemonHandle],
+    deadline: float,
+    effect_timeout: float,
+    think_time: float,
+    latencies: Dict[str, List[float]],
+    lost: Dict[str, int],
+    rotates: Dict[str, list],
+    results_lock: threading.Lock,
+    rng: random.Random,
+) -> None:
+    while time.monotonic() < deadline:
+        if not any(d.alive() for d in daemons):
+            return
+        candidates = [d for d in daemons if d.alive() and not d.lock.locked()]
+        daemon = rng.choice(candidates) if candidates else None
+        if daemon is None or not daemon.lock.acquire(blocking=False):
+            # Every live daemon is busy with another client; don't spin
+            time.sleep(think_time)
+            continue
+
+        if daemon.paused:
+            command = "resume"
+        else:
+            command = rng.choice(["pause", "pause", "rotate"])
+
+        try:
+            if command == "rotate":
+                measure_rotate(daemon, effect_timeout, rotates, results_lock)
+            else:
+                elapsed = measure_command(daemon, command, effect_timeout)
+                with results_lock:
+                    if elapsed is not None:
+                        latencies.setdefault(command, []).append(elapsed)
+                    else:
+                        lost[command] = lost.get(command, 0) + 1
+        except (FileNotFoundError, ValueError):
+            # The daemon rewrites the file in place, so a client can catch it
+            # truncated; that is a failed command, not a harness error
+            with results_lock:
+                lost[command] = lost.get(command, 0) + 1
+        finally:
+            daemon.lock.release()
+
+        time.sleep(think_time)
+
+
+def run(args) -> dict:
+    workdir = tempfile.mkdtemp(prefix="rotate-loadtest-")
+    interval = args.interval
+    effect_timeout = 2 * interval + 1.0
+
+    daemons: List[DaemonHandle] = []
+    try:
+        for i in range(args.daemons):
+            daemon_dir = os.path.join(workdir, f"d{i}")
+            os.makedirs(daemon_dir)
+            file_path = os.path.join(daemon_dir, "rotation")
+            create_rotation_file(file_path, TEAM, args.timer)
+            daemons.append(DaemonHandle(i, file_path, args.daemon_module, interval))
+
+        spawn_started = time.monotonic()
+        not_ready = [
+            d
+            for d in daemons
+            if not d.wait_for(lambda: d.ticks > 0 or d.exited_at is not None, 10)
+            or d.ticks == 0
+        ]
+        ready_seconds = time.monotonic() - spawn_started
+
+        latencies: Dict[str, List[float]] = {}
+        lost: Dict[str, int] = {}
+        rotates: Dict[str, list] = {"rewrite_seconds": [], "overwritten": []}
+        results_lock = threading.Lock()
+        deadline = time.monotonic() + args.duration
+        clients = [
+            threading.Thread(
+                target=run_client,
+                args=(
+                    daemons,
+                    deadline,
+                    effect_timeout,
+                    args.think_time,
+                    latencies,
+                    lost,
+                    rotates,
+                    results_lock,
+                    random.Random(args.seed + i),
+                ),
+                daemon=True,  # don't keep an interrupted harness alive
+            )
+            for i in range(args.clients)
+        ]
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+
+        rss_kb = [
+            kb for kb in (d.memory_kb("VmHWM") for d in daemons) if kb is not None
+        ]
+
+        # Let every timer run out and check that each daemon noticed on time
+        for daemon in daemons:
+            if daemon.alive() and daemon.paused:
+                with daemon.changed:
+                    seen = daemon.resumed_count
+                write_command(daemon.file_path, "resume")
+                daemon.wait_for(
+                    lambda: daemon.resumed_count > seen or not daemon.alive(),
+                    effect_timeout,
+                )
+
+        grace = 2 * interval + 1.0
+        missed = 0
+        for daemon in daemons:
+            with daemon.changed:
+                remaining = daemon.last_remaining or 0
+                last_tick = daemon.last_tick or time.monotonic()
+            expected = last_tick + remaining + grace
+            daemon.wait_for(
+                lambda: daemon.expired_at is not None or daemon.exited_at is not None,
+                max(0.0, expected - time.monotonic()),
+            )
+            if daemon.expired_at is None:
+                missed += 1
+
+        stop_latencies: List[float] = []
+        for daemon in daemons:
+            if daemon.process.poll() is None and daemon.expired_at is None:
+                start = time.monotonic()
+                write_command(daemon.file_path, "stop")
+                if daemon.wait_for(
+                    lambda: daemon.exited_at is not None, effect_timeout
+                ):
+                    stop_latencies.append(time.monotonic() - start)
+                else:
+                    lost["stop"] = lost.get("stop", 0) + 1
+        for daemon in daemons:
+            try:
+                daemon.process.wait(timeout=effect_timeout)
+            except subprocess.TimeoutExpired:
+                daemon.process.kill()
+                daemon.process.wait()
+        if stop_latencies:
+            latencies["stop"] = stop_latencies
+    finally:
+        # Also on errors and Ctrl-C: paused daemons would otherwise poll forever
+        for daemon in daemons:
+            if daemon.process.poll() is None:
+                daemon.process.kill()
+                daemon.process.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    jitter = [j for d in daemons for j in d.jitter]
+
+    return {
+        "daemons": args.daemons,
+        "clients": args.clients,
+        "daemon_module": args.daemon_module,
+        "ready_seconds": ready_seconds,
+        "not_ready": len(not_ready),
+        "latency_seconds": {k: percentiles(v) for k, v in sorted(latencies.items())},
+        "lost_commands": lost,
+        "rotate_rewrite_seconds": percentiles(rotates["rewrite_seconds"]),
+        "rotate_overwritten_by_daemon": sum(rotates["overwritten"]),
+        "tick_jitter_seconds": percentiles([abs(j) for j in jitter]),
+        "missed_expirations": missed,
+        "cpu_seconds": usage.ru_utime + usage.ru_stime,
+        "rss_kb": percentiles(rss_kb) if rss_kb else {"max": usage.ru_maxrss},
+    }
+
+
+def format_stats(stats: Dict[str, float], unit: float = 1000.0) -> str:
+    if not stats:
+        return "n/a"
+    return (
+        f"n={stats['count']} p50={stats['p50'] * unit:.1f} "
+        f"p90={stats['p90'] * unit:.1f} p99={stats['p99'] * unit:.1f} "
+        f"max={stats['max'] * unit:.1f}"
+    )
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"{report['daemons']} daemons ({report['daemon_module']}), "
+        f"{report['clients']} clients"
+    )
+    print(
+        f"Ready after {report['ready_seconds']:.2f}s "
+        f"({report['not_ready']} never ticked)"
+    )
+    print("Command-to-effect latency (ms):")
+    for command, stats in report["latency_seconds"].items():
+        print(f"  {command:<7} {format_stats(stats)}")
+    print(f"Lost commands: {report['lost_commands'] or 0}")
+    rewrite = report["rotate_rewrite_seconds"]
+    print(
+        f"`rotate rotate` file rewrites (ms): {format_stats(rewrite)}, "
+        f"{report['rotate_overwritten_by_daemon']} overwritten by the daemon"
+    )
+    print(f"Tick jitter (ms): {format_stats(report['tick_jitter_seconds'])}")
+    print(f"Missed expirations: {report['missed_expirations']}")
+    print(f"CPU: {report['cpu_seconds']:.2f}s total")
+    rss = report["rss_kb"]
+    if "p50" in rss:
+        print(f"Peak RSS (KiB): {format_stats(rss, unit=1)}")
+    else:
+        print(f"Peak RSS (KiB): max={rss['max']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--daemons", type=int, default=50)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--timer", default="0:20", help="turn length, MM:SS")
+    parser.add_argument("--interval", type=int, default=1)
+    parser.add_argument("--think-time", type=float, default=0.01)
+    parser.add_argument("--daemon-module", default="rotate.daemon")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    parser.add_argument(
+        "--max-rss-kb",
+        type=int,
+        help="exit with status 1 if any daemon's peak RSS exceeds this budget",
+    )
+    args = parser.parse_args()
+
+    # Unwind through run()'s cleanup when terminated, as on Ctrl-C
+    signal.signal(signal.SIGTERM, lambda sig, frame: sys.exit(128 + sig))
+    report = run(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    if args.max_rss_kb is not None and report["rss_kb"]["max"] > args.max_rss_kb:
+        print(
+            f"Peak RSS {report['rss_kb']['max']} KiB exceeds budget "
+            f"{args.max_rss_kb} KiB",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ from rotate.rotation import (
     create_rotation_file,
 )
 from rotate.ipc import write_command
+from rotate import trace
 
 
 def main():
@@ -36,6 +37,8 @@ def main():
         cat_rotation_file()
     elif command == "open" or command == "edit":
         open_rotation_file()
+    elif command == "serve":
+        serve()
     elif command == "help":
         print_usage()
     else:
@@ -49,6 +52,7 @@ def print_usage():
     print("\nCommands:")
     print("  init     Initialize a new rotation file (default: '.rotate/rotation')")
     print("  start    Start the timer daemon (default file: '.rotate/rotation')")
+    print("           --lean uses a minimal-footprint daemon")
     print("  pause    Pause the running timer (default file: '.rotate/rotation')")
     print("  resume   Resume a paused timer (default file: '.rotate/rotation')")
     print("  stop     Stop the running timer daemon (default file: '.rotate/rotation')")
@@ -57,6 +61,7 @@ def print_usage():
     )
     print("  cat      Display the content of the rotation file")
     print("  open     Open the rotation file in your default editor (also: edit)")
+    print("  serve    Serve JSON-RPC over stdin/stdout for editor integrations (--stdio)")
     print("  help     Show this help message")
     print("\nHooks:")
     print("  Place executable scripts in the .rotate/hooks/ directory.")
@@ -116,7 +121,9 @@ def send_command(command: str):
         return
 
     # Create IPC file
-    write_command(file_path, command)
+    command_id = trace.new_command_id()
+    with trace.span("write_command", command_id, flow="s", command=command):
+        write_command(file_path, command, command_id)
 
     print(f"Sent '{command}' command for {file_path}")
 
@@ -125,9 +132,13 @@ def start_timer():
     """Start the timer daemon."""
     from rotate.hooks import get_default_rotation_file_path
 
+    # --lean selects the minimal-footprint daemon
+    lean = "--lean" in sys.argv
+    args = [arg for arg in sys.argv[2:] if arg != "--lean"]
+
     file_path = get_default_rotation_file_path()
-    if len(sys.argv) >= 3:
-        file_path = sys.argv[2]
+    if len(args) >= 1:
+        file_path = args[0]
 
     # Check if file exists
     if not os.path.exists(file_path):
@@ -135,20 +146,29 @@ def start_timer():
         return
 
     # Get update interval if provided
-    update_interval = sys.argv[3] if len(sys.argv) > 3 else "1"
+    update_interval = args[1] if len(args) > 1 else "1"
 
     try:
-        # Start daemon process in background
-        subprocess.Popen(
-            [sys.executable, "-m", "rotate.daemon", file_path, update_interval],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
+        spawn_daemon(file_path, update_interval, lean)
         print(f"Timer daemon started for {file_path}")
     except Exception as e:
         print(f"Error starting daemon: {e}")
 
 
+def spawn_daemon(
+    file_path: str, update_interval: str = "1", lean: bool = False
+) -> subprocess.Popen:
+    """Start the timer daemon for a rotation file as a background process."""
+    module = "rotate.lean_daemon" if lean else "rotate.daemon"
+    # Discard daemon output: a long-lived parent (e.g. `rotate serve`) never
+    # drains the pipes, and a full pipe would block the daemon's tick loop
+    return subprocess.Popen(
+        [sys.executable, "-m", module, file_path, str(update_interval)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
 def rotate_team_members():
     """Rotate team members in the rotation file."""
     from rotate.hooks import get_default_rotation_file_path
@@ -218,6 +238,17 @@ def open_rotation_file():
     open_file(file_path)
 
 
+def serve():
+    """Run a long-lived JSON-RPC server for editor and status-bar plugins."""
+    from rotate.serve import serve_stdio
+
+    if len(sys.argv) >= 3 and sys.argv[2] != "--stdio":
+        print(f"Unknown serve transport: {sys.argv[2]} (only --stdio is supported)")
+        return
+
+    serve_stdio()
+
+
 if __name__ == "__main__":
     try:
         main()
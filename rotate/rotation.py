@@ -4,16 +4,36 @@ import sys
 import subprocess
 from typing import List
 from rotate.parse import parse_rotation_file, format_rotation, Rotation
+from rotate.cache import parse_cache_enabled, file_stamp, read_cache, write_cache
 
 
-def read_rotation_file(file_path: str) -> Rotation:
+def read_rotation_file(file_path: str, use_cache: bool | None = None) -> Rotation:
+    """Read and parse a rotation file.
+
+    With the sidecar cache enabled (use_cache, or ROTATE_PARSE_CACHE=1 when
+    unset), a parse is reused while the file's (inode, size, mtime) match.
+    """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Rotation file not found: {file_path}")
 
+    if use_cache is None:
+        use_cache = parse_cache_enabled()
+
     with open(file_path, "r") as f:
+        if not use_cache:
+            return parse_rotation_file(f.read())
+
+        # Stamp before reading: if the file changes in between, the cache
+        # is written under the old stamp and simply misses next time
+        st = os.fstat(f.fileno())
+        rotation = read_cache(file_path, file_stamp(st))
+        if rotation is not None:
+            return rotation
         content = f.read()
 
-    return parse_rotation_file(content)
+    rotation = parse_rotation_file(content)
+    write_cache(file_path, st, rotation)
+    return rotation
 
 
 def write_rotation_file(file_path: str, rotation: Rotation) -> None:
@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+"""Long-lived JSON-RPC 2.0 server over stdin/stdout.
+
+Editor and status-bar plugins keep one `rotate serve --stdio` process
+around instead of spawning `rotate cat` / `rotate pause` on every refresh.
+Messages are newline-delimited JSON objects, one request or response per line.
+
+Methods (all params optional, `file` defaults to `.rotate/rotation`):
+  status     {file}                  -> rotation as a dict
+  start      {file, interval, lean}  -> {"pid": ...}
+  pause      {file}                  -> null
+  resume     {file}                  -> null
+  stop       {file}                  -> null
+  rotate     {file, count}           -> rotation as a dict
+  subscribe  {file, interval}        -> subscription id
+  unsubscribe {subscription}         -> bool
+  shutdown   {}                      -> null, then the server exits
+
+Subscribers receive `rotation/changed` notifications with params
+{"subscription", "file", "rotation"} whenever the file changes on disk.
+"""
+import os
+import sys
+import json
+import threading
+import subprocess
+from typing import Any, Callable, Dict, List, Optional, TextIO
+from rotate.hooks import get_default_rotation_file_path
+from rotate.ipc import write_command
+from rotate import trace
+from rotate.main import spawn_daemon
+from rotate.rotate import rotate_team
+from rotate.rotation import read_rotation_file, write_rotation_file
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def file_stamp(file_path: str) -> Optional[tuple[int, int, int]]:
+    """Return (inode, size, mtime_ns) for a file, or None if it is missing."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class Subscription(threading.Thread):
+    """Watch a rotation file and push a notification whenever it changes."""
+
+    def __init__(
+        self,
+        subscription_id: int,
+        file_path: str,
+        notify: Callable[[str, dict], None],
+        interval: float = 0.25,
+    ):
+        super().__init__(daemon=True)
+        self.subscription_id = subscription_id
+        self.file_path = file_path
+        self.notify = notify
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.last_stamp = file_stamp(file_path)
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            stamp = file_stamp(self.file_path)
+            if stamp == self.last_stamp:
+                continue
+            self.last_stamp = stamp
+
+            try:
+                rotation = read_rotation_file(self.file_path).to_dict()
+            except Exception:
+                # Missing or half-written file; report it on the next change
+                rotation = None
+
+            self.notify(
+                "rotation/changed",
+                {
+                    "subscription": self.subscription_id,
+                    "file": self.file_path,
+                    "rotation": rotation,
+                },
+            )
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+
+class Server:
+    def __init__(self, output: TextIO):
+        self.output = output
+        self.output_lock = threading.Lock()
+        self.subscriptions: Dict[int, Subscription] = {}
+        self.daemons: List[subprocess.Popen] = []
+        self.next_subscription_id = 1
+        self.running = True
+        self.methods: Dict[str, Callable[[dict], Any]] = {
+            "status": self.status,
+            "start": self.start,
+            "pause": lambda params: self.send_command("pause", params),
+            "resume": lambda params: self.send_command("resume", params),
+            "stop": lambda params: self.send_command("stop", params),
+            "rotate": self.rotate,
+            "subscribe": self.subscribe,
+            "unsubscribe": self.unsubscribe,
+            "shutdown": self.shutdown,
+        }
+
+    def send(self, message: dict) -> None:
+        line = json.dumps(message, separators=(",", ":"))
+        with self.output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def notify(self, method: str, params: dict) -> None:
+        self.send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    def reap_daemons(self) -> None:
+        """Collect daemons that have exited so they don't linger as zombies."""
+        self.daemons = [daemon for daemon in self.daemons if daemon.poll() is None]
+
+    def handle_line(self, line: str) -> None:
+        self.reap_daemons()
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            self.send_error(None, PARSE_ERROR, f"Parse error: {e}")
+            return
+
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            self.send_error(None, INVALID_REQUEST, "Invalid request")
+            return
+
+        request_id = request.get("id")
+        is_notification = "id" not in request
+
+        try:
+            result = self.dispatch(request["method"], request.get("params") or {})
+        except RpcError as e:
+            if not is_notification:
+                self.send_error(request_id, e.code, e.message)
+            return
+        except Exception as e:
+            if not is_notification:
+                self.send_error(request_id, SERVER_ERROR, str(e))
+            return
+
+        if not is_notification:
+            self.send({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+    def send_error(self, request_id: Any, code: int, message: str) -> None:
+        self.send(
+            {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": {"code": code, "message": message},
+            }
+        )
+
+    def dispatch(self, method: str, params: dict) -> Any:
+        handler = self.methods.get(method)
+        if handler is None:
+            raise RpcError(METHOD_NOT_FOUND, f"Method not found: {method}")
+        if not isinstance(params, dict):
+            raise RpcError(INVALID_PARAMS, "Params must be an object")
+        return handler(params)
+
+    def file_path(self, params: dict) -> str:
+        file_path = params.get("file") or get_default_rotation_file_path()
+        if not os.path.exists(file_path):
+            raise RpcError(SERVER_ERROR, f"Rotation file not found: {file_path}")
+        return file_path
+
+    def status(self, params: dict) -> dict:
+        return read_rotation_file(self.file_path(params)).to_dict()
+
+    def start(self, params: dict) -> dict:
+        interval = params.get("interval", 1)
+        if not isinstance(interval, int) or interval < 1:
+            raise RpcError(INVALID_PARAMS, f"Invalid update interval: {interval}")
+        lean = bool(params.get("lean", False))
+        process = spawn_daemon(self.file_path(params), str(interval), lean)
+        self.daemons.append(process)
+        return {"pid": process.pid}
+
+    def send_command(self, command: str, params: dict) -> None:
+        file_path = self.file_path(params)
+        command_id = trace.new_command_id()
+        with trace.span("write_command", command_id, flow="s", command=command):
+            write_command(file_path, command, command_id)
+        return None
+
+    def rotate(self, params: dict) -> dict:
+        count = params.get("count", 1)
+        if not isinstance(count, int) or count < 0:
+            raise RpcError(INVALID_PARAMS, f"Invalid rotate count: {count}")
+
+        file_path = self.file_path(params)
+        rotated = read_rotation_file(file_path)
+        for _ in range(count):
+            rotated = rotate_team(rotated)
+        write_rotation_file(file_path, rotated)
+        return rotated.to_dict()
+
+    def subscribe(self, params: dict) -> int:
+        interval = params.get("interval", 0.25)
+        if not isinstance(interval, (int, float)) or interval <= 0:
+            raise RpcError(INVALID_PARAMS, f"Invalid poll interval: {interval}")
+
+        subscription_id = self.next_subscription_id
+        self.next_subscription_id += 1
+
+        subscription = Subscription(
+            subscription_id, self.file_path(params), self.notify, interval
+        )
+        self.subscriptions[subscription_id] = subscription
+        subscription.start()
+        return subscription_id
+
+    def unsubscribe(self, params: dict) -> bool:
+        subscription = self.subscriptions.pop(params.get("subscription"), None)
+        if subscription is None:
+            return False
+        subscription.stop()
+        return True
+
+    def shutdown(self, params: dict) -> None:
+        self.running = False
+        return None
+
+    def close(self) -> None:
+        for subscription in self.subscriptions.values():
+            subscription.stop()
+        self.subscriptions.clear()
+        # Running daemons outlive the server; only reap the finished ones
+        self.reap_daemons()
+
+
+def serve_stdio(stdin: TextIO = sys.stdin, output: TextIO = sys.stdout) -> None:
+    """Serve JSON-RPC requests from stdin until EOF or a shutdown request."""
+    server = Server(output)
+    try:
+        for line in stdin:
+            line = line.strip()
+            if line:
+                server.handle_line(line)
+            if not server.running:
+                break
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    serve_stdio()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+"""Opt-in Chrome trace-event recording.
+
+Set ROTATE_TRACE to a directory to record timestamped spans for the
+command path: `write_command` in the CLI, the wait until the daemon's next
+IPC poll, `handle_command`, the rotation file write and hook spawns. Spans
+are correlated across processes by command ID and linked with flow arrows.
+
+Each process keeps events in a bounded buffer (ROTATE_TRACE_BUFFER, default
+10000) and dumps it at exit to `<dir>/rotate-<pid>.json`. Merge them into a
+single file for https://ui.perfetto.dev with:
+
+    python -m rotate.trace merge <dir> [output.json]
+
+When ROTATE_TRACE is unset, `span` returns a shared no-op object and nothing
+is recorded.
+"""
+import os
+import sys
+import time
+import atexit
+import threading
+from collections import deque
+
+DEFAULT_BUFFER = 10000
+
+TRACE_DIR = os.environ.get("ROTATE_TRACE")
+ENABLED = bool(TRACE_DIR)
+
+
+def buffer_size() -> int:
+    """ROTATE_TRACE_BUFFER, falling back to the default on bad values."""
+    try:
+        return max(1, int(os.environ.get("ROTATE_TRACE_BUFFER", DEFAULT_BUFFER)))
+    except ValueError:
+        return DEFAULT_BUFFER
+
+
+events: deque = deque(maxlen=buffer_size() if ENABLED else 0)
+current_command: str | None = None
+
+
+def now_us() -> int:
+    # Wall clock, so spans from the CLI and the daemon line up
+    return time.time_ns() // 1000
+
+
+def new_command_id() -> str | None:
+    """Return a fresh command ID, or None when tracing is disabled."""
+    if not ENABLED:
+        return None
+    return f"{os.getpid():x}-{time.time_ns():x}"
+
+
+def set_command(command_id: str | None) -> None:
+    """Attribute following spans in this process to a received command."""
+    global current_command
+    current_command = command_id
+
+
+def take_command() -> str | None:
+    """Return the current command ID and stop attributing spans to it."""
+    global current_command
+    command_id, current_command = current_command, None
+    return command_id
+
+
+def finish_command() -> None:
+    """End the current command's flow when it causes no rotation file write."""
+    command_id = take_command()
+    if command_id:
+        now = now_us()
+        record("command done", now, now, command_id, flow="f")
+
+
+def record(
+    name: str,
+    start_us: int,
+    end_us: int,
+    command_id: str | None = None,
+    flow: str | None = None,
+    **args,
+) -> None:
+    """Record a complete span; `flow` is "s", "t" or "f" to link by command ID."""
+    pid = os.getpid()
+    tid = threading.get_native_id()
+    if command_id:
+        args["command_id"] = command_id
+    events.append(
+        {
+            "name": name,
+            "cat": "rotate",
+            "ph": "X",
+            "ts": start_us,
+            "dur": max(0, end_us - start_us),
+            "pid": pid,
+            "tid": tid,
+            "args": args,
+        }
+    )
+    if command_id and flow:
+        events.append(
+            {
+                "name": "command",
+                "cat": "command",
+                "ph": flow,
+                "id": command_id,
+                "ts": start_us,
+                "pid": pid,
+                "tid": tid,
+                "bp": "e",
+            }
+        )
+
+
+class Span:
+    __slots__ = ("name", "command_id", "flow", "args", "start_us")
+
+    def __init__(self, name: str, command_id: str | None, flow: str | None, args):
+        self.name = name
+        self.command_id = command_id
+        self.flow = flow
+        self.args = args
+
+    def __enter__(self):
+        self.start_us = now_us()
+        return self
+
+    def __exit__(self, *exc):
+        record(
+            self.name, self.start_us, now_us(), self.command_id, self.flow, **self.args
+        )
+        return False
+
+
+class NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+def span(name: str, command_id: str | None = None, flow: str | None = None, **args):
+    """Time a block; defaults to the command set with `set_command`."""
+    if not ENABLED:
+        return NULL_SPAN
+    return Span(name, command_id or current_command, flow, args)
+
+
+def dump(file_path: str | None = None) -> str | None:
+    """Write buffered events as Chrome trace-event JSON; return the path."""
+    if not events:
+        return None
+    import json
+
+    file_path = file_path or os.path.join(TRACE_DIR, f"rotate-{os.getpid()}.json")
+    process_name = " ".join([os.path.basename(sys.argv[0])] + sys.argv[1:2])
+    metadata = {
+        "name": "process_name",
+        "ph": "M",
+        "pid": os.getpid(),
+        "args": {"name": process_name},
+    }
+    try:
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        with open(file_path, "w") as f:
+            json.dump({"traceEvents": [metadata, *events]}, f)
+    except OSError as e:
+        # stderr: stdout may be a protocol stream, e.g. `rotate serve --stdio`
+        print(f"Warning: could not write trace {file_path}: {e}", file=sys.stderr)
+        return None
+    return file_path
+
+
+def merge(trace_dir: str) -> dict:
+    """Combine every per-process trace in a directory into one."""
+    import json
+
+    merged = []
+    for name in sorted(os.listdir(trace_dir)):
+        if name.startswith("rotate-") and name.endswith(".json"):
+            with open(os.path.join(trace_dir, name)) as f:
+                merged.extend(json.load(f)["traceEvents"])
+    return {"traceEvents": merged}
+
+
+if ENABLED:
+    atexit.register(dump)
+
+
+def main():
+    """CLI entry point for merging per-process traces."""
+    if len(sys.argv) < 3 or sys.argv[1] != "merge":
+        print("Usage: python -m rotate.trace merge <trace_dir> [output.json]")
+        sys.exit(1)
+
+    import json
+
+    merged = merge(sys.argv[2])
+    if len(sys.argv) > 3:
+        with open(sys.argv[3], "w") as f:
+            json.dump(merged, f)
+        print(f"Wrote {len(merged['traceEvents'])} events to {sys.argv[3]}")
+    else:
+        json.dump(merged, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
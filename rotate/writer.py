@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+import os
+import stat
+import time
+import threading
+from rotate.parse import Rotation, format_rotation
+from rotate import trace
+
+
+def copy_ownership(path: str, fd: int) -> None:
+    """Give `fd` the permission bits, owner and group of `path`, if it exists."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return
+    os.fchmod(fd, stat.S_IMODE(st.st_mode))
+    try:
+        os.fchown(fd, st.st_uid, st.st_gid)
+    except PermissionError:
+        # Only root may give a file away; the mode is still kept
+        pass
+
+
+def write_rotation_file_atomic(file_path: str, rotation: Rotation) -> None:
+    """Write the rotation to a temp file beside the target, then replace it.
+
+    Readers see either the old or the new content, never a truncated file.
+    A symlinked rotation file stays a symlink, and the replacement keeps the
+    original's mode and, where permitted, its owner.
+    """
+    real_path = os.path.realpath(file_path)
+    tmp_path = f"{real_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            copy_ownership(real_path, f.fileno())
+            f.write(format_rotation(rotation))
+        os.replace(tmp_path, real_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class RotationWriter(threading.Thread):
+    """Write-behind persistence for the daemon's rotation file.
+
+    The timer thread hands over snapshots with `submit` and never waits on
+    disk. The writer keeps a single slot: if it is still busy writing when
+    new snapshots arrive, only the latest is written and the others dropped.
+    """
+
+    def __init__(self, file_path: str, retries: int = 3, retry_delay: float = 0.2):
+        super().__init__(name="rotation-writer", daemon=True)
+        self.file_path = file_path
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.condition = threading.Condition()
+        self.pending: Rotation | None = None
+        self.pending_command: str | None = None
+        self.writing = False
+        self.closed = False
+
+    def submit(self, rotation: Rotation, command_id: str | None = None) -> None:
+        """Queue a snapshot; `command_id` traces the command that caused it."""
+        with self.condition:
+            self.pending = rotation
+            # A coalesced snapshot still carries the effect of an older command
+            self.pending_command = command_id or self.pending_command
+            self.condition.notify_all()
+
+    def run(self) -> None:
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending is not None or self.closed)
+                if self.pending is None:
+                    return
+                rotation, self.pending = self.pending, None
+                command_id, self.pending_command = self.pending_command, None
+                self.writing = True
+
+            try:
+                with trace.span("write_rotation_file", command_id, flow="f"):
+                    self.write(rotation)
+            finally:
+                with self.condition:
+                    self.writing = False
+                    self.condition.notify_all()
+
+    def write(self, rotation: Rotation) -> None:
+        for attempt in range(1, self.retries + 1):
+            try:
+                write_rotation_file_atomic(self.file_path, rotation)
+                print(f"File updated: {self.file_path}")
+                return
+            except OSError as e:
+                if attempt == self.retries:
+                    # Give up on this snapshot; the next one will try again
+                    print(f"Error writing {self.file_path}: {e}")
+                    return
+                time.sleep(self.retry_delay * attempt)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every submitted snapshot is on disk."""
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: self.pending is None and not self.writing, timeout
+            )
+
+    def close(self, timeout: float | None = None) -> bool:
+        """Flush the last snapshot and stop the writer thread."""
+        flushed = self.flush(timeout)
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.join(timeout)
+        return flushed
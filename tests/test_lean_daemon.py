@@ -0,0 +1,166 @@
+import os
+import sys
+import time
+import tempfile
+import unittest
+import subprocess
+import tracemalloc
+from rotate.ipc import write_command
+from rotate.rotation import create_rotation_file, read_rotation_file
+from rotate.lean_daemon import TickBuffer, format_seconds
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TICKS = 2000
+
+# Peak RSS of a counting-down lean daemon; ~11 MiB on CPython 3.12/Linux
+LEAN_RSS_BUDGET_KB = 16 * 1024
+
+
+def create_rotation(directory: str, timer: str, roster_size: int = 5) -> str:
+    file_path = os.path.join(directory, "rotation")
+    create_rotation_file(
+        file_path, [f"Member{i}" for i in range(roster_size)], initial_time=timer
+    )
+    return file_path
+
+
+def spawn(module: str, file_path: str) -> subprocess.Popen:
+    env = dict(os.environ, PYTHONPATH=PACKAGE_ROOT)
+    return subprocess.Popen(
+        [sys.executable, "-m", module, file_path, "1"],
+        cwd=os.path.dirname(file_path),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def peak_rss_kb(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+    raise AssertionError("VmHWM missing from /proc status")
+
+
+def measure_peak_rss_kb(module: str, directory: str) -> int:
+    file_path = create_rotation(directory, "0:30")
+    daemon = spawn(module, file_path)
+    try:
+        time.sleep(1.5)  # a few ticks in
+        return peak_rss_kb(daemon.pid)
+    finally:
+        write_command(file_path, "stop")
+        try:
+            daemon.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            daemon.kill()
+            daemon.wait()
+
+
+class TickBufferTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = create_rotation(self.directory.name, "10:00", 2000)
+        with open(self.file_path, "rb") as f:
+            rest = f.read().partition(b"\n")[2]
+        self.tail = b" / 10:00\n" + rest
+        self.tick = TickBuffer(600, self.tail)
+
+        # Keep the per-tick log line out of the test output
+        sys.stdout.flush()
+        self.stdout = os.dup(1)
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, 1)
+        os.close(devnull)
+
+    def tearDown(self):
+        os.dup2(self.stdout, 1)
+        os.close(self.stdout)
+        self.directory.cleanup()
+
+    def run_ticks(self, count: int) -> None:
+        tick = self.tick
+        for i in range(count):
+            end = tick.render(600 - i % 600)
+            tick.write(self.file_path)
+            tick.log(end)
+
+    def test_render_matches_format(self):
+        for seconds in (0, 9, 59, 60, 61, 599, 600):
+            end = self.tick.render(seconds)
+            self.assertEqual(
+                bytes(self.tick.buffer[: self.tick.width]),
+                format_seconds(seconds).encode().ljust(self.tick.width),
+            )
+            self.assertEqual(end, len(format_seconds(seconds)))
+
+    def test_write_replaces_whole_file(self):
+        self.tick.render(65)
+        self.tick.write(self.file_path)
+        with open(self.file_path, "rb") as f:
+            self.assertEqual(f.read(), b"1:05 " + self.tail)
+
+    def test_file_length_stays_fixed(self):
+        size = os.path.getsize(self.file_path)
+        for seconds in (600, 599, 60, 59, 0):
+            self.tick.render(seconds)
+            self.tick.write(self.file_path)
+            self.assertEqual(os.path.getsize(self.file_path), size)
+            rotation = read_rotation_file(self.file_path, use_cache=False)
+            self.assertEqual(
+                rotation.timer.remaining.minute * 60 + rotation.timer.remaining.second,
+                seconds,
+            )
+            self.assertEqual(len(rotation.team), 2000)
+
+    def test_ticks_do_not_grow_live_blocks(self):
+        self.run_ticks(100)  # warm up caches
+        before = sys.getallocatedblocks()
+        self.run_ticks(TICKS)
+        self.assertLess(sys.getallocatedblocks() - before, 16)
+
+    def test_ticks_do_not_copy_the_file(self):
+        self.run_ticks(100)
+        tracemalloc.start()
+        try:
+            self.run_ticks(TICKS)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # A few transient objects per tick, never a copy of the ~20 KB file
+        self.assertGreater(len(self.tail), 10 * 1024)
+        self.assertLess(peak, 2048)
+        self.assertLess(current, 512)
+
+
+@unittest.skipUnless(os.path.exists("/proc/self/status"), "needs /proc")
+class LeanDaemonProcessTest(unittest.TestCase):
+    def test_peak_rss_within_budget(self):
+        with tempfile.TemporaryDirectory() as directory:
+            lean = measure_peak_rss_kb("rotate.lean_daemon", directory)
+        with tempfile.TemporaryDirectory() as directory:
+            regular = measure_peak_rss_kb("rotate.daemon", directory)
+
+        self.assertLess(lean, LEAN_RSS_BUDGET_KB)
+        self.assertLess(lean, regular)
+
+    def test_expires_after_full_turn(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = create_rotation(directory, "0:02")
+            started = time.monotonic()
+            daemon = spawn("rotate.lean_daemon", file_path)
+            daemon.wait(timeout=10)
+            elapsed = time.monotonic() - started
+
+            with open(file_path) as f:
+                lines = f.read().splitlines()
+
+        self.assertGreaterEqual(elapsed, 2.0)
+        # Expired and rotated: timer reset, someone else typing
+        self.assertEqual(lines[0], "0:02 / 0:02")
+        self.assertNotEqual(lines[1], "Typing: Member0")
+
+
+if __name__ == "__main__":
+    unittest.main()
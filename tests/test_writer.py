@@ -0,0 +1,150 @@
+import io
+import os
+import stat
+import signal
+import tempfile
+import threading
+import unittest
+import contextlib
+from unittest import mock
+from rotate.daemon import setup_signal_handlers
+from rotate.rotation import create_rotation_file, read_rotation_file
+from rotate.writer import RotationWriter, write_rotation_file_atomic
+
+
+class WriteRotationFileAtomicTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.target = os.path.join(self.directory.name, "shared-rotation")
+        create_rotation_file(self.target, ["Alice", "Bob", "Charlie"])
+        self.rotation = read_rotation_file(self.target, use_cache=False)
+        self.rotation.team.append("Diana")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_writes_through_symlink(self):
+        link = os.path.join(self.directory.name, "rotation")
+        os.symlink(self.target, link)
+
+        write_rotation_file_atomic(link, self.rotation)
+
+        self.assertTrue(os.path.islink(link))
+        self.assertIn("Diana", read_rotation_file(self.target, use_cache=False).team)
+        self.assertEqual(os.listdir(self.directory.name).count("rotation"), 1)
+
+    def test_keeps_mode(self):
+        os.chmod(self.target, 0o640)
+
+        write_rotation_file_atomic(self.target, self.rotation)
+
+        self.assertEqual(stat.S_IMODE(os.stat(self.target).st_mode), 0o640)
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["shared-rotation"])
+
+
+class GatedWriter(RotationWriter):
+    """Records each snapshot it writes and holds the first until `gate` is set."""
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path, retry_delay=0)
+        self.gate = threading.Event()
+        self.writing_first = threading.Event()
+        self.written = []
+
+    def write(self, rotation):
+        if not self.written:
+            self.writing_first.set()
+            self.gate.wait(5)
+        self.written.append(rotation.team[-1])
+        super().write(rotation)
+
+
+class RotationWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "rotation")
+        create_rotation_file(self.file_path, ["Alice", "Bob", "Charlie"])
+        self.rotation = read_rotation_file(self.file_path, use_cache=False)
+        self.enterContext(contextlib.redirect_stdout(io.StringIO()))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def snapshot(self, name: str):
+        rotation = read_rotation_file(self.file_path, use_cache=False)
+        rotation.team.append(name)
+        return rotation
+
+    def written_team(self) -> list[str]:
+        return read_rotation_file(self.file_path, use_cache=False).team
+
+    def test_submit_coalesces_to_latest(self):
+        writer = GatedWriter(self.file_path)
+        writer.start()
+        writer.submit(self.snapshot("first"))
+        self.assertTrue(writer.writing_first.wait(5))
+
+        for name in ("second", "third", "last"):
+            writer.submit(self.snapshot(name))
+        writer.gate.set()
+
+        self.assertTrue(writer.close(5))
+        self.assertFalse(writer.is_alive())
+        self.assertEqual(writer.written, ["first", "last"])
+        self.assertEqual(self.written_team()[-1], "last")
+
+    def test_flush_and_close_time_out(self):
+        writer = GatedWriter(self.file_path)
+        writer.start()
+        writer.submit(self.snapshot("stuck"))
+        self.assertTrue(writer.writing_first.wait(5))
+
+        self.assertFalse(writer.flush(0.1))
+        self.assertFalse(writer.close(0.1))
+
+        writer.gate.set()
+        writer.join(5)
+        self.assertEqual(self.written_team()[-1], "stuck")
+
+    def test_write_retries_a_bounded_number_of_times(self):
+        writer = RotationWriter(self.file_path, retries=3, retry_delay=0)
+        with mock.patch(
+            "rotate.writer.write_rotation_file_atomic", side_effect=OSError("full")
+        ) as write:
+            writer.write(self.rotation)
+        self.assertEqual(write.call_count, 3)
+
+        with mock.patch(
+            "rotate.writer.write_rotation_file_atomic", side_effect=[OSError, None]
+        ) as write:
+            writer.write(self.rotation)
+        self.assertEqual(write.call_count, 2)
+
+    def test_signal_handler_flushes_before_exit(self):
+        handlers = {
+            sig: signal.getsignal(sig) for sig in (signal.SIGINT, signal.SIGTERM)
+        }
+        cwd = os.getcwd()
+        os.chdir(self.directory.name)  # no expire hooks here
+        try:
+            writer = GatedWriter(self.file_path)
+            writer.start()
+            setup_signal_handlers(self.file_path, writer)
+            writer.submit(self.snapshot("first"))
+            self.assertTrue(writer.writing_first.wait(5))
+            writer.submit(self.snapshot("pending"))
+            threading.Timer(0.2, writer.gate.set).start()
+
+            with self.assertRaises(SystemExit):
+                signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+        finally:
+            os.chdir(cwd)
+            for sig, handler in handlers.items():
+                signal.signal(sig, handler)
+
+        self.assertEqual(writer.written, ["first", "pending"])
+        self.assertEqual(self.written_team()[-1], "pending")
+
+
+if __name__ == "__main__":
+    unittest.main()